@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Thread-safe inventory containers for sharing one stock between worker threads.
+
+ConcurrentInventory keeps items in copy-on-write segments. Writers take the
+striped locks of the segments they change (in index order), build new
+segments and publish them together, so readers never block and always see
+a state the inventory was actually in: a whole day's update and a whole
+batch, or none of it. The daily update holds every segment lock, so it
+blocks mutations (not readers) while it runs; batches touching different
+segments run in parallel. GlobalLockInventory guards everything with a
+single lock and is kept as the baseline for the throughput benchmark.
+"""
+from __future__ import print_function
+
+import threading
+import time
+from contextlib import contextmanager
+
+from gilded_rose import GildedRose, Item
+
+
+def _copy_item(item):
+    return Item(item.name, item.sell_in, item.quality)
+
+
+class ConcurrentInventory(object):
+    """Copy-on-write inventory over striped segment locks
+
+    Added items act as handles for remove(); the inventory updates its own
+    copies, so read the current state with snapshot().
+    """
+
+    def __init__(self, items=(), shards=16):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._publish_lock = threading.Lock()
+        # One tuple of (handle, Item) per segment, replaced, never mutated
+        self._segments = tuple(() for _ in range(shards))
+        self.apply_batch(added=items)
+
+    def _index_for(self, item):
+        """Pick the segment owning an item (stable for the item's lifetime)"""
+        return hash(item) % len(self._locks)
+
+    def _group_by_segment(self, items):
+        groups = {}
+        for item in items:
+            groups.setdefault(self._index_for(item), []).append(item)
+        return groups
+
+    @contextmanager
+    def _locked(self, indices):
+        """Hold the locks of the given segments, acquired in index order"""
+        locks = [self._locks[index] for index in sorted(indices)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _publish(self, changes):
+        """Swap in new segments (index -> tuple) as one new version"""
+        with self._publish_lock:
+            segments = list(self._segments)
+            for index, segment in changes.items():
+                segments[index] = segment
+            self._segments = tuple(segments)
+
+    # Mutations
+
+    def add(self, item):
+        """Add a single item"""
+        self.apply_batch(added=[item])
+
+    def remove(self, item):
+        """Remove a single item (by the handle it was added with)"""
+        self.apply_batch(removed=[item])
+
+    def apply_batch(self, added=(), removed=()):
+        """Apply many adds and removes, published as one version"""
+        to_add = self._group_by_segment(added)
+        to_remove = self._group_by_segment(removed)
+        touched = set(to_add) | set(to_remove)
+        if not touched:
+            return
+        with self._locked(touched):
+            current = self._segments
+            changes = {}
+            for index in touched:
+                gone = set(id(item) for item in to_remove.get(index, ()))
+                segment = tuple(entry for entry in current[index]
+                                if id(entry[0]) not in gone)
+                changes[index] = segment + tuple(
+                    (item, _copy_item(item)) for item in to_add.get(index, ()))
+            self._publish(changes)
+
+    # Daily update
+
+    def update_quality(self):
+        """Run the daily update on copies and publish the new day at once"""
+        with self._locked(range(len(self._locks))):
+            changes = {}
+            for index, segment in enumerate(self._segments):
+                copies = [_copy_item(item) for _, item in segment]
+                GildedRose(copies).update_quality()
+                changes[index] = tuple(
+                    (handle, copy) for (handle, _), copy in zip(segment, copies))
+            self._publish(changes)
+
+    # Reads
+
+    def snapshot(self):
+        """Return copies of all items from the latest published version"""
+        segments = self._segments
+        return [_copy_item(item) for segment in segments for _, item in segment]
+
+    def __len__(self):
+        return sum(len(segment) for segment in self._segments)
+
+
+class GlobalLockInventory(object):
+    """Inventory guarded by one lock, the baseline for the benchmark
+
+    Like ConcurrentInventory, added items act as handles for remove() and
+    the inventory updates its own copies.
+    """
+
+    def __init__(self, items=()):
+        self._lock = threading.Lock()
+        self._entries = []
+        self.apply_batch(added=items)
+
+    def add(self, item):
+        """Add a single item"""
+        self.apply_batch(added=[item])
+
+    def remove(self, item):
+        """Remove a single item (by the handle it was added with)"""
+        self.apply_batch(removed=[item])
+
+    def apply_batch(self, added=(), removed=()):
+        """Apply many adds and removes under the global lock"""
+        gone = set(id(item) for item in removed)
+        copies = [(item, _copy_item(item)) for item in added]
+        with self._lock:
+            if gone:
+                self._entries = [entry for entry in self._entries
+                                 if id(entry[0]) not in gone]
+            self._entries.extend(copies)
+
+    def update_quality(self):
+        """Run the daily update over the whole inventory"""
+        with self._lock:
+            GildedRose([item for _, item in self._entries]).update_quality()
+
+    def snapshot(self):
+        """Return copies of all items"""
+        with self._lock:
+            return [_copy_item(item) for _, item in self._entries]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Throughput benchmark
+
+def _sample_items(count):
+    names = [
+        "+5 Dexterity Vest",
+        "Aged Brie",
+        "Sulfuras, Hand of Ragnaros",
+        "Backstage passes to a TAFKAL80ETC concert",
+        "Conjured Mana Cake",
+    ]
+    return [Item(names[i % len(names)], sell_in=i % 20, quality=i % 50)
+            for i in range(count)]
+
+
+def run_workload(inventory, seconds=1.0, readers=2, mutators=2, batch_size=32):
+    """Hammer an inventory with separate threads for a number of seconds
+
+    One thread runs the daily update, reader threads only take snapshots
+    and mutator threads only apply batches (each add or remove batch is
+    one mutation). Returns counts per kind ("updates", "reads",
+    "mutations") and the worst snapshot latency in seconds among
+    snapshots started while an update was running ("read_latency").
+    """
+    stop = threading.Event()
+    updating = threading.Event()
+    updates = [0]
+    reads = [0] * readers
+    latencies = [0.0] * readers
+    mutations = [0] * mutators
+
+    def updater():
+        while not stop.is_set():
+            updating.set()
+            inventory.update_quality()
+            updating.clear()
+            updates[0] += 1
+
+    def reader(slot):
+        while not stop.is_set():
+            during_update = updating.is_set()
+            start = time.perf_counter()
+            inventory.snapshot()
+            if during_update:
+                latencies[slot] = max(latencies[slot], time.perf_counter() - start)
+            reads[slot] += 1
+
+    def mutator(slot):
+        while not stop.is_set():
+            batch = _sample_items(batch_size)
+            inventory.apply_batch(added=batch)
+            inventory.apply_batch(removed=batch)
+            mutations[slot] += 2
+
+    threads = [threading.Thread(target=updater)]
+    threads.extend(threading.Thread(target=reader, args=(slot,))
+                   for slot in range(readers))
+    threads.extend(threading.Thread(target=mutator, args=(slot,))
+                   for slot in range(mutators))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {"updates": updates[0], "reads": sum(reads),
+            "mutations": sum(mutations), "read_latency": max(latencies or [0.0])}
+
+
+def main():
+    import sys
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    print("%-14s %10s %10s %12s %22s" % (
+        "", "updates/s", "reads/s", "mutations/s", "max read ms (update)"))
+    for label, inventory in [
+        ("global lock", GlobalLockInventory(_sample_items(10000))),
+        ("copy-on-write", ConcurrentInventory(_sample_items(10000))),
+    ]:
+        counts = run_workload(inventory, seconds=seconds)
+        print("%-14s %10.1f %10.1f %12.1f %22.1f" % (
+            label, counts["updates"] / seconds, counts["reads"] / seconds,
+            counts["mutations"] / seconds, counts["read_latency"] * 1000))
+
+
+if __name__ == "__main__":
+    main()
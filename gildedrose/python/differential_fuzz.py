@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Differential fuzzer comparing alternate update engines against GildedRose.
+
+An engine is a callable ``engine(items, days)`` that advances a list of
+Items in place by ``days`` days. Register alternate engines with
+register_engine(); fuzz() runs randomized, edge-heavy inventories through
+the reference and every registered engine and shrinks any mismatch to a
+minimal reproducer.
+"""
+from __future__ import print_function
+
+import random
+import time
+
+from gilded_rose import GildedRose, Item
+
+NAMES = [
+    "+5 Dexterity Vest",
+    "Elixir of the Mongoose",
+    "Aged Brie",
+    "Backstage passes to a TAFKAL80ETC concert",
+    "Sulfuras, Hand of Ragnaros",
+    "Conjured Mana Cake",
+    "Conjured Aged Brie",
+]
+SULFURAS = "Sulfuras, Hand of Ragnaros"
+EDGE_SELL_IN = [-2, -1, 0, 1, 5, 6, 7, 10, 11, 12]
+EDGE_QUALITY = [0, 1, 2, 48, 49, 50]
+
+_engines = {}
+
+
+def reference_engine(items, days):
+    """Advance items with the reference GildedRose implementation"""
+    gilded_rose = GildedRose(items)
+    for _ in range(days):
+        gilded_rose.update_quality()
+
+
+def projection_engine(items, days):
+    """Advance items with the closed-form GildedRose.project_quality"""
+    projection = GildedRose(items).project_quality(days)
+    for index, item in enumerate(items):
+        item.quality = projection.quality(index, days)
+        if item.name != SULFURAS:
+            item.sell_in -= days
+
+
+def register_engine(name, engine):
+    """Register an alternate engine to be checked against the reference"""
+    _engines[name] = engine
+
+
+def unregister_engine(name):
+    """Remove a previously registered engine"""
+    _engines.pop(name, None)
+
+
+def registered_engines():
+    """Return a copy of the registered engines keyed by name"""
+    return dict(_engines)
+
+
+register_engine("projection", projection_engine)
+
+
+class Mismatch(object):
+
+    def __init__(self, engine_name, items, days, expected, actual):
+        self.engine_name = engine_name
+        self.items = items
+        self.days = days
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self):
+        return "Mismatch(%s after %s days: %r -> expected %r, got %r)" % (
+            self.engine_name, self.days, self.items, self.expected, self.actual)
+
+
+# Inventory generation
+
+def random_state(rng, size):
+    """Generate (name, sell_in, quality) tuples biased toward rule edges"""
+    states = []
+    for _ in range(size):
+        name = rng.choice(NAMES)
+        if rng.random() < 0.7:
+            sell_in = rng.choice(EDGE_SELL_IN)
+        else:
+            sell_in = rng.randint(-10, 30)
+        if name == SULFURAS:
+            quality = 80
+        elif rng.random() < 0.7:
+            quality = rng.choice(EDGE_QUALITY)
+        else:
+            quality = rng.randint(0, 50)
+        states.append((name, sell_in, quality))
+    return states
+
+
+def _make_items(states):
+    return [Item(name, sell_in, quality) for name, sell_in, quality in states]
+
+
+def _run(engine, states, days):
+    items = _make_items(states)
+    engine(items, days)
+    return [(item.name, item.sell_in, item.quality) for item in items]
+
+
+def _differs(engine, states, days):
+    return _run(reference_engine, states, days) != _run(engine, states, days)
+
+
+# Shrinking
+
+def _smaller_values(value):
+    """Candidate replacements for value, simplest first"""
+    candidates = [0, value // 2, value - 1 if value > 0 else value + 1]
+    return [c for c in candidates if c != value and abs(c) <= abs(value)]
+
+
+def _drop_items(engine, states, days):
+    """Remove items not needed to reproduce the mismatch"""
+    for state in states:
+        if _differs(engine, [state], days):
+            return [state]
+    index = 0
+    while index < len(states) and len(states) > 1:
+        candidate = states[:index] + states[index + 1:]
+        if _differs(engine, candidate, days):
+            states = candidate
+        else:
+            index += 1
+    return states
+
+
+def shrink(engine, states, days):
+    """Reduce a failing (states, days) pair to a minimal reproducer"""
+    changed = True
+    while changed:
+        changed = False
+        smaller = _drop_items(engine, states, days)
+        if len(smaller) < len(states):
+            states = smaller
+            changed = True
+        for fewer_days in range(days):
+            if _differs(engine, states, fewer_days):
+                days = fewer_days
+                changed = True
+                break
+        for index, (name, sell_in, quality) in enumerate(states):
+            for field in (1, 2):
+                if name == SULFURAS and field == 2:
+                    continue
+                for value in _smaller_values(states[index][field]):
+                    state = list(states[index])
+                    state[field] = value
+                    candidate = states[:index] + [tuple(state)] + states[index + 1:]
+                    if _differs(engine, candidate, days):
+                        states = candidate
+                        changed = True
+                        break
+    return states, days
+
+
+# Driver
+
+def fuzz(engines=None, iterations=1000, size=64, days=30, seed=None,
+         stats=None):
+    """Compare engines against the reference, return a list of Mismatch
+
+    Each iteration runs a random number of days up to ``days`` so that
+    mismatches later reset by the rules (e.g. after a concert) still show.
+    If a ``stats`` dict is given, its "item_days" entry is set to the
+    item-days simulated across the reference and all engines.
+    """
+    item_days = 0
+    if engines is None:
+        engines = registered_engines()
+    rng = random.Random(seed)
+    mismatches = []
+    failing = set()
+    for _ in range(iterations):
+        states = random_state(rng, size)
+        run_days = rng.randint(1, days)
+        expected = _run(reference_engine, states, run_days)
+        item_days += size * run_days
+        for name, engine in engines.items():
+            if name in failing:
+                continue
+            item_days += size * run_days
+            if _run(engine, states, run_days) != expected:
+                small_states, small_days = shrink(engine, states, run_days)
+                mismatches.append(Mismatch(
+                    name, _make_items(small_states), small_days,
+                    _run(reference_engine, small_states, small_days),
+                    _run(engine, small_states, small_days)))
+                failing.add(name)
+    if stats is not None:
+        stats["item_days"] = item_days
+    return mismatches
+
+
+def main():
+    import sys
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    size, days = 64, 30
+    stats = {}
+    start = time.perf_counter()
+    mismatches = fuzz(iterations=iterations, size=size, days=days, seed=0,
+                      stats=stats)
+    elapsed = time.perf_counter() - start
+    print("%d engine(s) checked in %.2fs, %.0f item-days/s" % (
+        len(registered_engines()), elapsed, stats["item_days"] / elapsed))
+    for mismatch in mismatches:
+        print(mismatch)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 # -*- coding: utf-8 -*-
+from quality_projection import QualityProjection
+
 
 class GildedRose(object):
 
-    def __init__(self, items):
+    def __init__(self, items, profiler=None):
         self.items = items
+        self.profiler = profiler
 
     def update_quality(self):
         """Update quality and sell_in for all items"""
+        if self.profiler is not None:
+            with self.profiler.day():
+                self._update_all()
+        else:
+            self._update_all()
+
+    def _update_all(self):
+        """Apply the daily rules to every item"""
         for item in self.items:
             if self._is_aged_brie(item):
                 self._update_aged_brie(item)
@@ -19,6 +30,42 @@ class GildedRose(object):
             else:
                 self._update_normal_item(item)
 
+    def project_quality(self, days, typecode=None, path=None):
+        """Project every item's quality for the next days without updating
+
+        Returns a QualityProjection with one row per item and days + 1
+        columns (column 0 is today's quality). Rows are computed in closed
+        form, so no Item is copied or updated. typecode is "b" (int8) or
+        "h" (int16); by default the smallest that fits is used. With a path
+        the matrix is written to that file (created even when empty) and
+        memory-mapped. Each row is written as soon as it is computed, so
+        only one row is held as Python ints at a time.
+        """
+        if days < 0:
+            raise ValueError("days must not be negative")
+        # Projected quality always stays within min(q, 0)..max(q, 50)
+        qualities = [item.quality for item in self.items]
+        low = min(qualities + [0])
+        high = max(qualities + [50])
+        projection = QualityProjection(
+            len(self.items), days, low, high, typecode, path)
+        for index, item in enumerate(self.items):
+            projection.set_row(index, self._project_item(item, days))
+        return projection
+
+    def _project_item(self, item, days):
+        """Return an item's quality for day 0..days"""
+        if self._is_aged_brie(item):
+            return self._project_aged_brie(item, days)
+        elif self._is_backstage_pass(item):
+            return self._project_backstage_pass(item, days)
+        elif self._is_sulfuras(item):
+            return [item.quality] * (days + 1)
+        elif self._is_conjured(item):
+            return self._project_degrading(item, days, rate=2)
+        else:
+            return self._project_degrading(item, days, rate=1)
+
     # Item type identification methods
 
     def _is_aged_brie(self, item):
@@ -114,6 +161,35 @@ class GildedRose(object):
         if item.sell_in < 0:
             self._decrease_quality(item, amount=2)
 
+    # Closed-form projections (quality after d days, d >= 1)
+
+    def _days_past(self, days, threshold):
+        """Count days k in 1..days with k > threshold"""
+        return max(0, days - max(threshold, 0))
+
+    def _project_degrading(self, item, days, rate):
+        """Normal and Conjured items: rate per day, twice that after sell date"""
+        sell_in, quality = item.sell_in, item.quality
+        return [quality] + [
+            max(0, quality - rate * (d + self._days_past(d, sell_in)))
+            for d in range(1, days + 1)]
+
+    def _project_aged_brie(self, item, days):
+        """Aged Brie: +1 per day, +2 after sell date, capped at 50"""
+        sell_in, quality = item.sell_in, item.quality
+        return [quality] + [
+            min(50, quality + d + self._days_past(d, sell_in))
+            for d in range(1, days + 1)]
+
+    def _project_backstage_pass(self, item, days):
+        """Backstage passes: +1/+2/+3 as the concert nears, 0 after it"""
+        sell_in, quality = item.sell_in, item.quality
+        return [quality] + [
+            0 if d > sell_in else
+            min(50, quality + d + self._days_past(d, sell_in - 10)
+                + self._days_past(d, sell_in - 5))
+            for d in range(1, days + 1)]
+
 
 class Item:
     def __init__(self, name, sell_in, quality):
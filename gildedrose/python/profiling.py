@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Profiling for multi-day Gilded Rose simulations, standard library only.
+
+Profiler traces every Python and builtin call while a day is running and
+records self time per call stack. Stacks are written in the collapsed
+format understood by flamegraph.pl and speedscope, and each day's time is
+split into categories (dispatch, clamping, rules, item, io, other) for a
+per-day time series. Attribute access on Item is not a call, so it is
+counted in the self time of the rule method doing it.
+"""
+from __future__ import print_function
+
+import sys
+import time
+
+CATEGORIES = ["dispatch", "clamping", "rules", "item", "io", "other"]
+
+_IO_NAMES = ("print", "write", "flush")
+_CLAMPING_NAMES = ("_increase_quality", "_decrease_quality")
+_THIS_FILE = __file__
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    if code.co_filename == _THIS_FILE:
+        return None
+    qualname = getattr(code, "co_qualname", None)
+    if qualname is not None:
+        return qualname
+    return _qualify(frame, code)
+
+
+def _qualify(frame, code):
+    """Build "Class.method" on Pythons without co_qualname (before 3.11)"""
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        for cls in type(owner).__mro__:
+            function = cls.__dict__.get(code.co_name)
+            if getattr(function, "__code__", None) is code:
+                return "%s.%s" % (cls.__name__, code.co_name)
+    return code.co_name
+
+
+def _builtin_name(function):
+    return getattr(function, "__qualname__", getattr(function, "__name__", "?"))
+
+
+def categorize(stack):
+    """Pick the category for a call stack (tuple of names, root first)"""
+    leaf = stack[-1]
+    if leaf.startswith("Item."):
+        return "item"
+    if any(name.split(".")[-1] in _IO_NAMES for name in stack):
+        return "io"
+    if any(name.startswith("GildedRose._is_") for name in stack):
+        return "dispatch"
+    if any(name.split(".")[-1] in _CLAMPING_NAMES for name in stack):
+        return "clamping"
+    if any(name.startswith("GildedRose.") for name in stack):
+        return "rules"
+    return "other"
+
+
+class Profiler(object):
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.active = False
+        self.stacks = {}
+        self.days = []
+        self._stack = []
+
+    def day(self):
+        """Trace one simulated day; nested calls join the running day"""
+        return _Day(self)
+
+    def _start_day(self):
+        self.active = True
+        self._current = dict((category, 0.0) for category in CATEGORIES)
+        self._stack = [["day", self.clock(), 0.0]]
+        sys.setprofile(self._trace)
+
+    def _end_day(self):
+        sys.setprofile(None)
+        self._close_frames()
+        self.days.append(self._current)
+        self.active = False
+
+    def _trace(self, frame, event, arg):
+        now = self.clock()
+        if event == "call":
+            self._stack.append([_frame_name(frame), now, 0.0])
+        elif event == "c_call":
+            self._stack.append([_builtin_name(arg), now, 0.0])
+        elif len(self._stack) > 1:
+            # return, c_return, c_exception
+            self._pop(now)
+
+    def _pop(self, now):
+        names = tuple(entry[0] for entry in self._stack if entry[0] is not None)
+        name, start, children = self._stack.pop()
+        if name is None:
+            # The profiler's own frames are not reported; their time stays
+            # with the caller
+            return
+        elapsed = now - start
+        self._record(names, elapsed - children)
+        self._stack[-1][2] += elapsed
+
+    def _close_frames(self):
+        # Drop the profiler frames (and the setprofile call inside them)
+        # that were traced while the day was being switched off
+        now = self.clock()
+        names = [entry[0] for entry in self._stack]
+        if None in names:
+            own_index = names.index(None)
+            now = self._stack[own_index][1]
+            del self._stack[own_index:]
+        while len(self._stack) > 1:
+            self._pop(now)
+        names = (self._stack[0][0],)
+        self._record(names, now - self._stack[0][1] - self._stack[0][2])
+        self._stack = []
+
+    def _record(self, names, seconds):
+        self.stacks[names] = self.stacks.get(names, 0.0) + seconds
+        self._current[categorize(names)] += seconds
+
+    # Reporting
+
+    def totals(self):
+        """Return seconds per category over all days"""
+        totals = dict((category, 0.0) for category in CATEGORIES)
+        for day in self.days:
+            for category, seconds in day.items():
+                totals[category] += seconds
+        return totals
+
+    def collapsed_lines(self):
+        """Return collapsed stacks with self time in microseconds"""
+        lines = []
+        for names, seconds in sorted(self.stacks.items()):
+            micros = int(round(seconds * 1e6))
+            if micros > 0:
+                lines.append("%s %d" % (";".join(names), micros))
+        return lines
+
+    def write_collapsed(self, path):
+        """Write flamegraph-ready collapsed stacks to path"""
+        with open(path, "w") as output:
+            for line in self.collapsed_lines():
+                output.write(line + "\n")
+
+    def write_days(self, path):
+        """Write the per-day time series (microseconds) as CSV to path"""
+        with open(path, "w") as output:
+            output.write(",".join(["day", "total"] + CATEGORIES) + "\n")
+            for index, day in enumerate(self.days):
+                values = [sum(day.values())] + [day[c] for c in CATEGORIES]
+                output.write(",".join(
+                    [str(index)] + ["%d" % round(v * 1e6) for v in values]) + "\n")
+
+    def write(self, prefix):
+        """Write prefix.collapsed and prefix.days.csv"""
+        self.write_collapsed(prefix + ".collapsed")
+        self.write_days(prefix + ".days.csv")
+
+
+class _Day(object):
+    """Context manager switching tracing on and off for one day"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.started = False
+
+    def __enter__(self):
+        if not self.profiler.active:
+            self.started = True
+            self.profiler._start_day()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.started:
+            self.profiler._end_day()
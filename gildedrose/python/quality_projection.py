@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Storage for GildedRose.project_quality: an (items x days + 1) matrix of
+int8 or int16 quality values, in memory or memory-mapped to a file.
+"""
+import mmap
+from array import array
+
+
+class QualityProjection(object):
+    """(items x days + 1) quality matrix stored flat in row-major order"""
+
+    _RANGES = {"b": (-128, 127), "h": (-32768, 32767)}
+
+    def __init__(self, item_count, days, low, high, typecode=None, path=None):
+        self.days = days
+        self.columns = days + 1
+        self.item_count = item_count
+        if typecode is None:
+            typecode = "b" if low >= -128 and high <= 127 else "h"
+        if typecode not in self._RANGES:
+            raise ValueError("typecode must be 'b' (int8) or 'h' (int16)")
+        minimum, maximum = self._RANGES[typecode]
+        if low < minimum or high > maximum:
+            raise ValueError("quality out of range for typecode %r" % typecode)
+        self.typecode = typecode
+
+        self._file = None
+        self._mmap = None
+        cells = item_count * self.columns
+        size = cells * array(typecode).itemsize
+        if path is not None:
+            self._file = open(path, "w+b")
+            self._file.truncate(size)
+        if self._file is None or size == 0:
+            # mmap cannot map an empty file
+            self.data = array(typecode, bytes(size))
+        else:
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+            self.data = memoryview(self._mmap).cast(typecode)
+
+    def set_row(self, index, values):
+        """Store one item's quality for day 0..days"""
+        start = index * self.columns
+        self.data[start:start + self.columns] = array(self.typecode, values)
+
+    def row(self, index):
+        """Return one item's quality for day 0..days as a list"""
+        start = index * self.columns
+        return self.data[start:start + self.columns].tolist()
+
+    def quality(self, index, day):
+        """Return one item's quality on a given day"""
+        return self.data[index * self.columns + day]
+
+    def total_quality_per_day(self):
+        """Return total inventory quality for day 0..days"""
+        totals = [0] * self.columns
+        for index in range(self.item_count):
+            totals = [total + value
+                      for total, value in zip(totals, self.row(index))]
+        return totals
+
+    def first_day_at_zero(self):
+        """Return the first day each item's quality is 0 (None if never)"""
+        days = []
+        for index in range(self.item_count):
+            row = self.row(index)
+            days.append(row.index(0) if 0 in row else None)
+        return days
+
+    def close(self):
+        """Release the memory map and file, if any"""
+        if self._mmap is not None:
+            self.data.release()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the thread-safe inventory containers
+"""
+import threading
+import unittest
+
+from concurrent_inventory import (
+    ConcurrentInventory, GlobalLockInventory, run_workload)
+from gilded_rose import GildedRose, Item
+
+
+def _state(items):
+    return sorted((item.name, item.sell_in, item.quality) for item in items)
+
+
+class ConcurrentInventoryTest(unittest.TestCase):
+    """Single-threaded behaviour of the sharded inventory"""
+
+    def test_update_matches_gilded_rose(self):
+        """Sharded update gives the same result as a plain GildedRose"""
+        def make():
+            return [
+                Item("+5 Dexterity Vest", sell_in=10, quality=20),
+                Item("Aged Brie", sell_in=2, quality=0),
+                Item("Sulfuras, Hand of Ragnaros", sell_in=0, quality=80),
+                Item("Backstage passes to a TAFKAL80ETC concert", sell_in=5, quality=49),
+                Item("Conjured Mana Cake", sell_in=3, quality=6),
+            ]
+        expected = make()
+        inventory = ConcurrentInventory(make(), shards=3)
+        for _ in range(20):
+            GildedRose(expected).update_quality()
+            inventory.update_quality()
+
+        self.assertEqual(_state(inventory.snapshot()), _state(expected))
+
+    def test_apply_batch_adds_and_removes(self):
+        """Batches add and remove items by identity"""
+        keep = Item("Aged Brie", sell_in=2, quality=0)
+        drop = Item("Aged Brie", sell_in=2, quality=0)
+        inventory = ConcurrentInventory([keep, drop], shards=4)
+
+        inventory.apply_batch(removed=[drop])
+
+        self.assertEqual(len(inventory), 1)
+        inventory.add(Item("Vegemite", sell_in=1, quality=1))
+        self.assertEqual(len(inventory), 2)
+
+    def test_snapshot_returns_copies(self):
+        """Mutating a snapshot does not change the inventory"""
+        inventory = ConcurrentInventory([Item("Vegemite", sell_in=1, quality=5)])
+        inventory.snapshot()[0].quality = 0
+
+        self.assertEqual(inventory.snapshot()[0].quality, 5)
+
+    def test_rejects_zero_shards(self):
+        """At least one shard is required"""
+        with self.assertRaises(ValueError):
+            ConcurrentInventory(shards=0)
+
+
+class ConcurrentInventoryStressTest(unittest.TestCase):
+    """Many threads mutating and reading while the daily update runs"""
+
+    def test_snapshots_see_whole_days_and_whole_batches(self):
+        """No lost or doubled update, no half-applied day or batch"""
+        for make in (lambda items: ConcurrentInventory(items, shards=8),
+                     GlobalLockInventory):
+            self._stress(make)
+
+    def _stress(self, make):
+        stable = [Item("+5 Dexterity Vest", sell_in=1000, quality=50)
+                  for _ in range(100)]
+        inventory = make(stable)
+        updates = 50
+        errors = []
+
+        def worker(seed):
+            try:
+                for round_ in range(50):
+                    name = "Batch %s-%s" % (seed, round_)
+                    batch = [Item(name, sell_in=10, quality=10) for _ in range(10)]
+                    inventory.apply_batch(added=batch)
+                    self._check(inventory.snapshot(), name, 10, errors)
+                    inventory.apply_batch(removed=batch)
+                    self._check(inventory.snapshot(), name, 0, errors)
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        def updater():
+            for _ in range(updates):
+                inventory.update_quality()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        threads.append(threading.Thread(target=updater))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(inventory), 100)
+        self.assertEqual(set(item.sell_in for item in inventory.snapshot()),
+                         set([1000 - updates]))
+
+    def _check(self, snapshot, name, expected_count, errors):
+        """Stable items share one day; the batch is all there or all gone"""
+        days = set(item.sell_in for item in snapshot
+                   if item.name == "+5 Dexterity Vest")
+        if len(days) != 1:
+            errors.append("mixed days %s" % sorted(days))
+        count = sum(1 for item in snapshot if item.name == name)
+        if count != expected_count:
+            errors.append("%s: %s of %s items" % (name, count, expected_count))
+
+    def test_workload_runs_on_both_inventories(self):
+        """Benchmark workload counts each kind of operation separately"""
+        for inventory in (GlobalLockInventory(), ConcurrentInventory()):
+            counts = run_workload(inventory, seconds=0.05, readers=1, mutators=1)
+            self.assertEqual(sorted(counts),
+                             ["mutations", "read_latency", "reads", "updates"])
+            self.assertGreater(counts["updates"], 0)
+            self.assertGreater(counts["reads"], 0)
+            self.assertEqual(len(inventory), 0)
+
+    def test_global_lock_inventory_owns_copies(self):
+        """The baseline copies added items, like the sharded inventory"""
+        item = Item("Vegemite", sell_in=1, quality=5)
+        inventory = GlobalLockInventory([item])
+        inventory.update_quality()
+
+        self.assertEqual((item.sell_in, item.quality), (1, 5))
+        self.assertEqual(_state(inventory.snapshot()), [("Vegemite", 0, 4)])
+        inventory.remove(item)
+        self.assertEqual(len(inventory), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the differential fuzzer
+"""
+import unittest
+
+from differential_fuzz import (
+    SULFURAS, fuzz, projection_engine, random_state, reference_engine,
+    register_engine, registered_engines, shrink, unregister_engine)
+
+
+def _buggy_backstage_engine(items, days):
+    """Reference behaviour, except backstage passes skip the 5-day bonus"""
+    for _ in range(days):
+        before = [item.sell_in for item in items]
+        reference_engine(items, 1)
+        for item, sell_in in zip(items, before):
+            if (item.name.startswith("Backstage") and sell_in < 6
+                    and item.sell_in >= 0 and 0 < item.quality < 50):
+                item.quality -= 1
+
+
+class DifferentialFuzzTest(unittest.TestCase):
+    """Tests for inventory generation, comparison and shrinking"""
+
+    def test_random_state_keeps_sulfuras_at_80(self):
+        """Generated Sulfuras always has its legendary quality"""
+        import random
+        states = random_state(random.Random(1), 500)
+        self.assertTrue(all(q == 80 for name, _, q in states if name == SULFURAS))
+        self.assertTrue(all(0 <= q <= 50 for name, _, q in states if name != SULFURAS))
+
+    def test_reference_engine_has_no_mismatches(self):
+        """The reference engine agrees with itself"""
+        mismatches = fuzz({"reference": reference_engine}, iterations=20, seed=3)
+        self.assertEqual(mismatches, [])
+
+    def test_projection_engine_matches_reference(self):
+        """The closed-form projection is registered and agrees with the reference"""
+        self.assertIs(registered_engines()["projection"], projection_engine)
+        self.assertEqual(fuzz(iterations=200, days=60, seed=11), [])
+
+    def test_stats_count_item_days(self):
+        """Item-days are counted for the reference and every engine"""
+        stats = {}
+        fuzz({"reference": reference_engine}, iterations=3, size=10, days=1, stats=stats)
+
+        self.assertEqual(stats["item_days"], 2 * 3 * 10)
+
+    def test_mismatch_is_shrunk_to_single_item(self):
+        """A buggy engine is reported with a minimal reproducer"""
+        mismatches = fuzz({"buggy": _buggy_backstage_engine}, iterations=50, seed=7)
+
+        self.assertEqual(len(mismatches), 1)
+        mismatch = mismatches[0]
+        self.assertEqual(mismatch.engine_name, "buggy")
+        self.assertEqual(len(mismatch.items), 1)
+        self.assertTrue(mismatch.items[0].name.startswith("Backstage"))
+        self.assertEqual(mismatch.days, 1)
+        self.assertEqual((mismatch.items[0].sell_in, mismatch.items[0].quality), (1, 0))
+        self.assertNotEqual(mismatch.expected, mismatch.actual)
+
+    def test_shrink_reduces_items_days_and_values(self):
+        """Shrinking drops passing items, extra days and large values"""
+        states = [
+            ("Aged Brie", 3, 20),
+            ("Backstage passes to a TAFKAL80ETC concert", 12, 10),
+            ("Conjured Mana Cake", 4, 30),
+        ]
+        small_states, small_days = shrink(_buggy_backstage_engine, states, 20)
+
+        self.assertEqual(small_days, 1)
+        self.assertEqual(small_states,
+                         [("Backstage passes to a TAFKAL80ETC concert", 1, 0)])
+
+    def test_register_engine(self):
+        """Registered engines are picked up by default"""
+        register_engine("copy", reference_engine)
+        try:
+            self.assertIn("copy", registered_engines())
+            self.assertEqual(fuzz(iterations=5, seed=1), [])
+        finally:
+            unregister_engine("copy")
+        self.assertNotIn("copy", registered_engines())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,9 @@
 Characterization tests for Gilded Rose
 These tests document the current behavior of the system before refactoring
 """
+import os
+import shutil
+import tempfile
 import unittest
 from gilded_rose import Item, GildedRose
 
@@ -553,5 +556,90 @@ class ConjuredItemsTest(unittest.TestCase):
         self.assertEqual(items[0].quality, 4)  # -2 quality (was -1, now fixed)
 
 
+class ProjectionTest(unittest.TestCase):
+    """Tests for projecting quality without updating items"""
+
+    def _items(self):
+        return [
+            Item("+5 Dexterity Vest", sell_in=10, quality=20),
+            Item("Aged Brie", sell_in=2, quality=0),
+            Item("Sulfuras, Hand of Ragnaros", sell_in=-1, quality=80),
+            Item("Backstage passes to a TAFKAL80ETC concert", sell_in=15, quality=20),
+            Item("Conjured Mana Cake", sell_in=3, quality=6),
+        ]
+
+    def test_projection_matches_daily_updates(self):
+        """Every cell equals the quality after that many update_quality calls"""
+        projection = GildedRose(self._items()).project_quality(30)
+        items = self._items()
+        gilded_rose = GildedRose(items)
+        for day in range(31):
+            for index, item in enumerate(items):
+                self.assertEqual(projection.quality(index, day), item.quality)
+            gilded_rose.update_quality()
+
+    def test_projection_does_not_update_items(self):
+        """Projecting leaves the inventory untouched"""
+        items = self._items()
+        GildedRose(items).project_quality(90)
+
+        self.assertEqual(items[0].sell_in, 10)
+        self.assertEqual(items[0].quality, 20)
+
+    def test_projection_uses_smallest_integer_type(self):
+        """int8 is used when it fits, int16 otherwise"""
+        self.assertEqual(GildedRose(self._items()).project_quality(5).typecode, "b")
+        large = [Item("Sulfuras, Hand of Ragnaros", sell_in=0, quality=300)]
+        self.assertEqual(GildedRose(large).project_quality(5).typecode, "h")
+        with self.assertRaises(ValueError):
+            GildedRose(large).project_quality(5, typecode="b")
+
+    def test_total_quality_per_day(self):
+        """Totals sum every item's quality per day"""
+        items = [Item("Vegemite", sell_in=1, quality=3), Item("Aged Brie", sell_in=1, quality=49)]
+        totals = GildedRose(items).project_quality(3).total_quality_per_day()
+
+        self.assertEqual(totals, [52, 52, 50, 50])
+
+    def test_first_day_at_zero(self):
+        """First zero-quality day per item, None if it never happens"""
+        items = [
+            Item("Vegemite", sell_in=1, quality=3),
+            Item("Aged Brie", sell_in=1, quality=10),
+            Item("Backstage passes to a TAFKAL80ETC concert", sell_in=2, quality=10),
+            Item("Conjured Mana Cake", sell_in=5, quality=0),
+        ]
+        days = GildedRose(items).project_quality(10).first_day_at_zero()
+
+        self.assertEqual(days, [2, None, 3, 0])
+
+    def test_memory_mapped_projection(self):
+        """A projection written to disk holds the same matrix"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "projection.bin")
+        in_memory = GildedRose(self._items()).project_quality(90)
+        with GildedRose(self._items()).project_quality(90, path=path) as mapped:
+            self.assertEqual(mapped.row(3), in_memory.row(3))
+            self.assertEqual(mapped.total_quality_per_day(), in_memory.total_quality_per_day())
+
+        self.assertEqual(os.path.getsize(path), 5 * 91)
+
+    def test_empty_memory_mapped_projection_creates_file(self):
+        """An empty inventory still creates the (empty) file"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "projection.bin")
+        with GildedRose([]).project_quality(90, path=path) as projection:
+            self.assertEqual(projection.total_quality_per_day(), [0] * 91)
+
+        self.assertEqual(os.path.getsize(path), 0)
+
+    def test_negative_days_rejected(self):
+        """Projecting a negative number of days is an error"""
+        with self.assertRaises(ValueError):
+            GildedRose(self._items()).project_quality(-1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the simulation profiler
+"""
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from gilded_rose import GildedRose, Item
+from profiling import CATEGORIES, Profiler, _qualify, categorize
+from texttest_fixture import main
+
+
+class CategorizeTest(unittest.TestCase):
+    """Tests for attributing call stacks to categories"""
+
+    def test_dispatch(self):
+        """Time under an _is_* check counts as dispatch"""
+        stack = ("day", "GildedRose.update_quality", "GildedRose._is_aged_brie")
+        self.assertEqual(categorize(stack), "dispatch")
+
+    def test_clamping_includes_builtins_below_it(self):
+        """min/max inside the quality helpers count as clamping"""
+        stack = ("day", "GildedRose.update_quality",
+                 "GildedRose._update_normal_item", "GildedRose._decrease_quality", "max")
+        self.assertEqual(categorize(stack), "clamping")
+
+    def test_rules(self):
+        """Other GildedRose methods count as rules"""
+        stack = ("day", "GildedRose.update_quality", "GildedRose._update_aged_brie")
+        self.assertEqual(categorize(stack), "rules")
+
+    def test_io_and_item(self):
+        """print counts as io, Item methods below it as item"""
+        self.assertEqual(categorize(("day", "simulate_day", "print")), "io")
+        self.assertEqual(categorize(("day", "simulate_day", "print", "Item.__repr__")), "item")
+
+    def test_other(self):
+        """Anything else counts as other"""
+        self.assertEqual(categorize(("day",)), "other")
+
+
+class QualifyTest(unittest.TestCase):
+    """Tests for naming methods on Pythons without co_qualname"""
+
+    def _frame(self, method):
+        class Frame(object):
+            f_code = method.__code__
+            f_locals = {"self": GildedRose([])}
+        return Frame()
+
+    def test_method_is_named_after_defining_class(self):
+        """Methods get the class that defines them, even on a subclass"""
+        class Subclass(GildedRose):
+            pass
+        frame = self._frame(GildedRose._is_aged_brie)
+        frame.f_locals = {"self": Subclass([])}
+
+        self.assertEqual(_qualify(frame, frame.f_code), "GildedRose._is_aged_brie")
+
+    def test_function_without_self_keeps_its_name(self):
+        """Plain functions keep their bare name"""
+        frame = self._frame(main)
+        frame.f_locals = {}
+
+        self.assertEqual(_qualify(frame, frame.f_code), "main")
+
+
+class ProfilerTest(unittest.TestCase):
+    """Tests for tracing GildedRose updates"""
+
+    def test_profiled_update_gives_same_result(self):
+        """Profiling does not change the simulation"""
+        items = [Item("Aged Brie", sell_in=2, quality=0)]
+        plain = [Item("Aged Brie", sell_in=2, quality=0)]
+        gilded_rose = GildedRose(items, profiler=Profiler())
+        for _ in range(5):
+            gilded_rose.update_quality()
+            GildedRose(plain).update_quality()
+
+        self.assertEqual((items[0].sell_in, items[0].quality),
+                         (plain[0].sell_in, plain[0].quality))
+
+    def test_each_update_is_one_day(self):
+        """Every update_quality call adds a day to the time series"""
+        profiler = Profiler()
+        gilded_rose = GildedRose([Item("Vegemite", sell_in=3, quality=5)], profiler)
+        gilded_rose.update_quality()
+        gilded_rose.update_quality()
+
+        self.assertEqual(len(profiler.days), 2)
+        self.assertEqual(sorted(profiler.days[0]), sorted(CATEGORIES))
+        self.assertIsNone(sys.getprofile())
+
+    def test_stacks_attribute_rule_methods(self):
+        """Collapsed stacks name the rule methods on the hot path"""
+        profiler = Profiler()
+        GildedRose([Item("Vegemite", sell_in=3, quality=5)], profiler).update_quality()
+        stacks = [";".join(names) for names in profiler.stacks]
+
+        self.assertIn("day;GildedRose._update_all;"
+                      "GildedRose._is_aged_brie", stacks)
+        self.assertIn("day;GildedRose._update_all;"
+                      "GildedRose._update_normal_item;"
+                      "GildedRose._decrease_quality;max", stacks)
+
+    def test_profiler_frames_are_not_reported(self):
+        """Switching days on and off leaves no profiler frames in the stacks"""
+        profiler = Profiler()
+        with profiler.day():
+            GildedRose([Item("Vegemite", sell_in=3, quality=5)], profiler).update_quality()
+        names = set(name for stack in profiler.stacks for name in stack)
+
+        self.assertNotIn("setprofile", names)
+        self.assertFalse([name for name in names
+                          if name.startswith(("Profiler.", "_Day."))])
+
+    def test_nested_days_join_running_day(self):
+        """An update inside a running day is not counted separately"""
+        profiler = Profiler()
+        with profiler.day():
+            GildedRose([Item("Vegemite", sell_in=3, quality=5)], profiler).update_quality()
+
+        self.assertEqual(len(profiler.days), 1)
+
+
+class FixtureProfilingTest(unittest.TestCase):
+    """Tests for the --profile switch of the TextTest fixture"""
+
+    def _run_fixture(self, *args):
+        orig_stdout, orig_stderr, orig_argv = sys.stdout, sys.stderr, sys.argv
+        try:
+            sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+            sys.argv = ["texttest_fixture.py"] + list(args)
+            main()
+        finally:
+            sys.stdout, sys.stderr, sys.argv = orig_stdout, orig_stderr, orig_argv
+
+    def test_fixture_writes_collapsed_stacks_and_days(self):
+        """--profile writes collapsed stacks and the per-day CSV"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        prefix = os.path.join(directory, "profile")
+        self._run_fixture("3", "--profile", prefix)
+
+        with open(prefix + ".days.csv") as days:
+            rows = days.read().splitlines()
+        self.assertEqual(rows[0], "day,total," + ",".join(CATEGORIES))
+        self.assertEqual(len(rows), 1 + 4)
+        with open(prefix + ".collapsed") as collapsed:
+            lines = collapsed.read().splitlines()
+        self.assertTrue(any(line.startswith("day;simulate_day;print ") for line in lines))
+
+    def test_fixture_profile_without_prefix_prints_usage(self):
+        """--profile without a prefix exits with a usage message"""
+        with self.assertRaises(SystemExit) as raised:
+            self._run_fixture("2", "--profile")
+
+        self.assertIn("usage:", str(raised.exception.code))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 from __future__ import print_function
 
 from gilded_rose import *
+from profiling import CATEGORIES, Profiler
 
 
 def main():
@@ -19,15 +20,37 @@ def main():
     ]
     days = 2
     import sys
-    if len(sys.argv) > 1:
-        days = int(sys.argv[1]) + 1
+    args = [str(arg) for arg in sys.argv[1:]]
+    profile_prefix = None
+    if "--profile" in args:
+        index = args.index("--profile")
+        if index + 1 >= len(args):
+            sys.exit("usage: texttest_fixture.py [days] [--profile PREFIX]")
+        profile_prefix = args[index + 1]
+        del args[index:index + 2]
+    if args:
+        days = int(args[0]) + 1
+    profiler = Profiler() if profile_prefix else None
     for day in range(days):
-        print("-------- day %s --------" % day)
-        print("name, sellIn, quality")
-        for item in items:
-            print(item)
-        print("")
-        GildedRose(items).update_quality()
+        if profiler is None:
+            simulate_day(day, items)
+        else:
+            with profiler.day():
+                simulate_day(day, items, profiler)
+    if profiler is not None:
+        profiler.write(profile_prefix)
+        totals = profiler.totals()
+        for category in CATEGORIES:
+            sys.stderr.write("%-9s %10.0f us\n" % (category, totals[category] * 1e6))
+
+
+def simulate_day(day, items, profiler=None):
+    print("-------- day %s --------" % day)
+    print("name, sellIn, quality")
+    for item in items:
+        print(item)
+    print("")
+    GildedRose(items, profiler).update_quality()
 
 
 if __name__ == "__main__":